@@ -1,7 +1,7 @@
 # Check the expected file interst working values
 import pandas as pd
 
-expected_df = pd.read_excel("expected_output.xlsx")
+expected_df = pd.read_excel("expected_output.xlsx", engine="calamine")
 
 print("Unique interst working values:")
 print(expected_df["interst working"].unique())
@@ -10,42 +10,23 @@ print("\nValue counts:")
 print(expected_df["interst working"].value_counts())
 
 # Check if interst working ever equals Age - Due days
-expected_df["calculated_working"] = expected_df["Age"] - expected_df["Due days"]
-expected_df["match"] = (
-    expected_df["interst working"] == expected_df["calculated_working"]
-)
+calculated_working = expected_df["Age"].to_numpy() - expected_df["Due days"].to_numpy()
+match = expected_df["interst working"].to_numpy() == calculated_working
 
+match_counts = pd.Series(match).value_counts()
 print("\nDoes interst working match (Age - Due days)?")
-print(expected_df["match"].value_counts())
+print(match_counts)
 
-# Show some examples where it matches
-matches = expected_df[expected_df["match"] == True]
-print(f"\nMatching rows: {len(matches)}")
-if len(matches) > 0:
-    print(
-        matches[
-            [
-                "Customer Name",
-                "Age",
-                "Due days",
-                "interst working",
-                "calculated_working",
-            ]
-        ].head()
-    )
+# Show some examples of matching and non-matching rows in one pass
+samples = (
+    expected_df[["Customer Name", "Age", "Due days", "interst working"]]
+    .assign(calculated_working=calculated_working, match=match)
+    .groupby("match", sort=False)
+    .head(5)
+)
 
-# Show some examples where it doesn't match
-non_matches = expected_df[expected_df["match"] == False]
-print(f"\nNon-matching rows: {len(non_matches)}")
-if len(non_matches) > 0:
-    print(
-        non_matches[
-            [
-                "Customer Name",
-                "Age",
-                "Due days",
-                "interst working",
-                "calculated_working",
-            ]
-        ].head()
-    )
+for label, matched in (("Matching", True), ("Non-matching", False)):
+    print(f"\n{label} rows: {match_counts.get(matched, 0)}")
+    examples = samples[samples["match"] == matched]
+    if len(examples) > 0:
+        print(examples.drop(columns="match"))
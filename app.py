@@ -1,7 +1,9 @@
 # app.py - Main Streamlit application with modular structure
 
+import hashlib
 import streamlit as st
 import pandas as pd
+from io import BytesIO
 
 # Import modules
 from config import (
@@ -13,12 +15,25 @@ from config import (
 )
 from data_processor import process_excel
 from data_verifier import (
+    KEY_COLUMNS,
     compare_dataframes,
     get_detailed_mismatches,
     get_value_comparison,
+    match_rows,
 )
-from utils import to_excel_bytes, validate_input_columns, get_summary_stats
+from utils import (
+    df_shrink,
+    to_excel_bytes,
+    validate_input_columns,
+    get_summary_stats,
+    read_excel_file,
+)
+
 
+# Copy-on-Write lets filtered frames be modified without defensive copies;
+# it is always on from pandas 3.0, so only opt in on 2.x
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
 
 # Page configuration
 st.set_page_config(
@@ -26,6 +41,46 @@ st.set_page_config(
 )
 
 
+def file_key(uploaded_file):
+    """Content hash of an uploaded file, used as the cache key"""
+    return hashlib.blake2b(uploaded_file.getvalue(), digest_size=16).hexdigest()
+
+
+@st.cache_data(max_entries=4, show_spinner="Reading Excel file...")
+def load_excel(key, _file_bytes, file_name, columns=None):
+    """Parse uploaded Excel bytes, reusing the result across reruns"""
+    return df_shrink(read_excel_file(BytesIO(_file_bytes), file_name, columns))
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def process_cached(key, _df_raw, due_days, daily_rate, working_days, ob_age):
+    """Run process_excel, reusing the result until the file or config changes"""
+    return process_excel(_df_raw, due_days, daily_rate, working_days, ob_age)
+
+
+@st.cache_data(max_entries=4, show_spinner="Comparing data...")
+def verify_cached(key, _processed_df, _expected_df):
+    """Run the verifier checks, reusing the results until either input changes"""
+    # Join the two frames on their key columns once for both row checks
+    matches = None
+    if set(KEY_COLUMNS) <= set(_processed_df.columns) & set(_expected_df.columns):
+        matches = match_rows(_processed_df, _expected_df, KEY_COLUMNS)
+
+    return (
+        compare_dataframes(_processed_df, _expected_df),
+        get_detailed_mismatches(_processed_df, _expected_df, matches=matches),
+        get_value_comparison(_processed_df, _expected_df, matches=matches),
+    )
+
+
+def render_metrics(metrics):
+    """Render (label, value) or (label, value, options) tuples as one metric row"""
+    with st.container():
+        columns = st.columns(len(metrics))
+        for col, (label, value, *options) in zip(columns, metrics):
+            col.metric(label, value, **(options[0] if options else {}))
+
+
 def render_sidebar():
     """Render sidebar with configuration options"""
     st.sidebar.header("⚙️ Configuration")
@@ -84,7 +139,13 @@ def render_data_processing_tab(config):
 
     if uploaded_file is not None:
         # Read the uploaded file
-        df_raw = pd.read_excel(uploaded_file)
+        raw_key = file_key(uploaded_file)
+        df_raw = load_excel(
+            raw_key,
+            uploaded_file.getvalue(),
+            uploaded_file.name,
+            tuple(REQUIRED_INPUT_COLUMNS),
+        )
 
         # Validate input columns
         is_valid, missing = validate_input_columns(df_raw, REQUIRED_INPUT_COLUMNS)
@@ -95,9 +156,9 @@ def render_data_processing_tab(config):
 
         # Display original data info
         st.subheader("📋 Original Data")
-        col1, col2 = st.columns(2)
-        col1.metric("Total Rows", df_raw.shape[0])
-        col2.metric("Total Columns", df_raw.shape[1])
+        render_metrics(
+            [("Total Rows", df_raw.shape[0]), ("Total Columns", df_raw.shape[1])]
+        )
 
         # Show preview
         with st.expander("View Original Data Preview"):
@@ -107,23 +168,33 @@ def render_data_processing_tab(config):
 
         # Process the data
         try:
-            df_processed = process_excel(
-                df_raw, due_days, daily_rate, working_days, ob_age
+            df_processed = process_cached(
+                raw_key, df_raw, due_days, daily_rate, working_days, ob_age
             )
 
-            # Store in session state for verification tab
+            # Store in session state for verification tab, with the inputs
+            # that produced it as its cache key
             st.session_state["processed_data"] = df_processed
+            st.session_state["processed_key"] = (
+                raw_key,
+                due_days,
+                daily_rate,
+                working_days,
+                ob_age,
+            )
 
             # Display processed data info
             st.subheader("✅ Processed Data")
-            col1, col2, col3 = st.columns(3)
-            col1.metric("Filtered Rows", df_processed.shape[0])
-            col2.metric("Output Columns", df_processed.shape[1])
+            metrics = [
+                ("Filtered Rows", df_processed.shape[0]),
+                ("Output Columns", df_processed.shape[1]),
+            ]
 
             # Get summary stats
             stats = get_summary_stats(df_processed, "interest amount")
             if stats:
-                col3.metric("Total Interest", f"₹{stats['sum']:,.2f}")
+                metrics.append(("Total Interest", f"₹{stats['sum']:,.2f}"))
+            render_metrics(metrics)
 
             # Show processed data
             st.dataframe(df_processed, use_container_width=True)
@@ -133,11 +204,14 @@ def render_data_processing_tab(config):
             # Summary statistics
             st.subheader("📈 Summary Statistics")
             if stats:
-                col1, col2, col3, col4 = st.columns(4)
-                col1.metric("Total Interest", f"₹{stats['sum']:,.2f}")
-                col2.metric("Average Interest", f"₹{stats['mean']:,.2f}")
-                col3.metric("Max Interest", f"₹{stats['max']:,.2f}")
-                col4.metric("Min Interest", f"₹{stats['min']:,.2f}")
+                render_metrics(
+                    [
+                        ("Total Interest", f"₹{stats['sum']:,.2f}"),
+                        ("Average Interest", f"₹{stats['mean']:,.2f}"),
+                        ("Max Interest", f"₹{stats['max']:,.2f}"),
+                        ("Min Interest", f"₹{stats['min']:,.2f}"),
+                    ]
+                )
 
             # Download button
             excel_data = to_excel_bytes(df_processed, "Interest Calculation")
@@ -198,9 +272,12 @@ def render_data_verification_tab():
 
     # Show processed data summary
     st.subheader("📊 Processed Data Summary")
-    col1, col2 = st.columns(2)
-    col1.metric("Processed Rows", len(processed_df))
-    col2.metric("Processed Columns", len(processed_df.columns))
+    render_metrics(
+        [
+            ("Processed Rows", len(processed_df)),
+            ("Processed Columns", len(processed_df.columns)),
+        ]
+    )
 
     st.divider()
 
@@ -213,37 +290,50 @@ def render_data_verification_tab():
 
     if expected_file is not None:
         # Read expected file
-        expected_df = pd.read_excel(expected_file)
+        expected_key = file_key(expected_file)
+        expected_df = load_excel(
+            expected_key, expected_file.getvalue(), expected_file.name
+        )
 
         st.subheader("📋 Expected Data Summary")
-        col1, col2 = st.columns(2)
-        col1.metric("Expected Rows", len(expected_df))
-        col2.metric("Expected Columns", len(expected_df.columns))
+        render_metrics(
+            [
+                ("Expected Rows", len(expected_df)),
+                ("Expected Columns", len(expected_df.columns)),
+            ]
+        )
 
         st.divider()
 
-        # Compare dataframes
-        results = compare_dataframes(processed_df, expected_df)
+        # Compare dataframes, reusing earlier results on reruns
+        results, mismatches, value_comp = verify_cached(
+            (st.session_state.get("processed_key"), expected_key),
+            processed_df,
+            expected_df,
+        )
 
         # Display comparison results
         st.subheader("📊 Comparison Results")
 
         # Row comparison
-        col1, col2, col3 = st.columns(3)
-        col1.metric("Processed Rows", results["row_comparison"]["processed_rows"])
-        col2.metric("Expected Rows", results["row_comparison"]["expected_rows"])
-
         row_diff = results["row_comparison"]["difference"]
         if row_diff > 0:
-            col3.metric(
-                "Row Difference", f"+{row_diff}", delta=row_diff, delta_color="inverse"
-            )
+            row_diff_value = f"+{row_diff}"
+            row_diff_options = {"delta": row_diff, "delta_color": "inverse"}
         elif row_diff < 0:
-            col3.metric(
-                "Row Difference", str(row_diff), delta=row_diff, delta_color="inverse"
-            )
+            row_diff_value = str(row_diff)
+            row_diff_options = {"delta": row_diff, "delta_color": "inverse"}
         else:
-            col3.metric("Row Difference", "0 ✅", delta=0, delta_color="off")
+            row_diff_value = "0 ✅"
+            row_diff_options = {"delta": 0, "delta_color": "off"}
+
+        render_metrics(
+            [
+                ("Processed Rows", results["row_comparison"]["processed_rows"]),
+                ("Expected Rows", results["row_comparison"]["expected_rows"]),
+                ("Row Difference", row_diff_value, row_diff_options),
+            ]
+        )
 
         st.divider()
 
@@ -272,16 +362,26 @@ def render_data_verification_tab():
         with col1:
             st.markdown("**Extra Customers in Processed:**")
             if results["extra_in_processed"]:
-                for customer in results["extra_in_processed"]:
-                    st.write(f"➕ {customer}")
+                st.dataframe(
+                    pd.DataFrame({"Extra Customers": results["extra_in_processed"]}),
+                    hide_index=True,
+                    height=300,
+                    use_container_width=True,
+                )
             else:
                 st.success("No extra customers")
 
         with col2:
             st.markdown("**Missing Customers in Processed:**")
             if results["missing_in_processed"]:
-                for customer in results["missing_in_processed"]:
-                    st.write(f"➖ {customer}")
+                st.dataframe(
+                    pd.DataFrame(
+                        {"Missing Customers": results["missing_in_processed"]}
+                    ),
+                    hide_index=True,
+                    height=300,
+                    use_container_width=True,
+                )
             else:
                 st.success("No missing customers")
 
@@ -290,8 +390,6 @@ def render_data_verification_tab():
         # Detailed mismatches
         st.subheader("🔍 Detailed Row Mismatches")
 
-        mismatches = get_detailed_mismatches(processed_df, expected_df)
-
         if "Message" in mismatches.columns:
             st.success(mismatches["Message"].iloc[0])
         else:
@@ -312,8 +410,6 @@ def render_data_verification_tab():
         # Value comparison for matching rows
         st.subheader("🔢 Value Comparison (Matching Rows)")
 
-        value_comp = get_value_comparison(processed_df, expected_df)
-
         if "Message" in value_comp.columns:
             st.success(value_comp["Message"].iloc[0])
         else:
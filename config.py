@@ -6,9 +6,18 @@ DEFAULT_PER_DAY_INTEREST_RATE = 0.06
 DEFAULT_INTEREST_WORKING_DAYS = 31
 DEFAULT_OPENING_BALANCE_AGE = 300
 
+# Minimum filtered rows before the numba interest kernel is used
+NUMBA_MIN_ROWS = 100_000
+
+# Oldest polars release whose join API the verifier's Polars path uses
+MIN_POLARS_VERSION = (1, 24)
+
 # Columns to drop from raw data
 COLUMNS_TO_DROP = ["Sales person", "Sale Person"]
 
+# Low-cardinality text columns stored as categoricals
+CATEGORICAL_COLUMNS = ["Region", "Area Name", "Market", "Type", "Status"]
+
 # Final output column order
 FINAL_COLUMNS = [
     "Region",
@@ -1,7 +1,17 @@
 # data_processor.py - Data processing functions
 
+import re
+
+import numpy as np
 import pandas as pd
-from config import COLUMNS_TO_DROP, FINAL_COLUMNS
+from config import CATEGORICAL_COLUMNS, COLUMNS_TO_DROP, FINAL_COLUMNS
+from kernels import compute_interest
+
+# Rupee symbols, thousands separators and whitespace in currency cells
+CURRENCY_NOISE_PATTERN = re.compile(r"[₹,\s]+")
+
+# Surrounding whitespace and the trailing ' Days' unit in Age cells
+AGE_NOISE_PATTERN = re.compile(r"^\s+|\s*Days\s*$")
 
 
 def clean_currency_column(series):
@@ -9,12 +19,11 @@ def clean_currency_column(series):
     Clean currency column by removing rupee symbol and commas
     Returns numeric series
     """
-    cleaned = (
-        series.astype(str)
-        .str.replace("₹", "", regex=False)
-        .str.replace(",", "", regex=False)
-        .str.strip()
-    )
+    # Cells Excel already stored as numbers need no text cleaning
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype("float64")
+
+    cleaned = series.astype(str).str.replace(CURRENCY_NOISE_PATTERN, "", regex=True)
     return pd.to_numeric(cleaned, errors="coerce")
 
 
@@ -23,10 +32,28 @@ def clean_age_column(series):
     Clean Age column by removing ' Days' text
     Returns numeric series
     """
-    cleaned = series.astype(str).str.replace(" Days", "", regex=False).str.strip()
+    # Cells Excel already stored as numbers or durations need no text cleaning
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    if pd.api.types.is_timedelta64_dtype(series):
+        return series.dt.days
+
+    cleaned = series.astype(str).str.replace(AGE_NOISE_PATTERN, "", regex=True)
     return pd.to_numeric(cleaned, errors="coerce")
 
 
+def category_equals(series, value):
+    """
+    Compare a column to a single value using categorical integer codes
+    Returns boolean numpy array
+    """
+    categorical = series.astype("category")
+    categories = categorical.cat.categories
+    if value not in categories:
+        return np.zeros(len(categorical), dtype=bool)
+    return categorical.cat.codes.to_numpy() == categories.get_loc(value)
+
+
 def process_excel(df, due_days, daily_rate, working_days, ob_age):
     """
     Process raw Excel data and calculate interest
@@ -41,14 +68,33 @@ def process_excel(df, due_days, daily_rate, working_days, ob_age):
     Returns:
     - Processed DataFrame with interest calculations
     """
-    # Filter only Overdue status rows
-    df_filtered = df[df["Status"] == "Overdue"].copy()
-
-    # Remove unnecessary columns if they exist
-    df_filtered = df_filtered.drop(
-        columns=[col for col in COLUMNS_TO_DROP if col in df_filtered.columns]
+    # Clean Age for Overdue rows only
+    overdue = category_equals(df["Status"], "Overdue")
+    age = clean_age_column(df["Age"][overdue]).to_numpy(
+        dtype="float64", na_value=np.nan
     )
 
+    # For Customer Opening Balance rows, set Age to specified value
+    is_opening = category_equals(df["Type"][overdue], "Customer Opening Balance")
+    age = np.where(is_opening, np.float64(ob_age), age)
+
+    # Keep Overdue rows where Age is greater than Due days threshold,
+    # fused into a single mask so the frame is only materialized once
+    above_due = age > due_days
+    mask = overdue.copy()
+    mask[overdue] = above_due
+
+    # Select kept rows without the unnecessary columns in one pass
+    kept_columns = [col for col in df.columns if col not in COLUMNS_TO_DROP]
+    df_filtered = df.loc[mask, kept_columns]
+
+    # Whole-day Ages are stored in the smallest integer type that fits
+    df_filtered["Age"] = pd.to_numeric(age[above_due], downcast="integer")
+
+    # Store low-cardinality text columns as categoricals
+    for col in CATEGORICAL_COLUMNS:
+        df_filtered[col] = df_filtered[col].astype("category")
+
     # Clean Balance Due column
     df_filtered["Balance Due"] = clean_currency_column(
         df_filtered["Balance Due"]
@@ -57,47 +103,36 @@ def process_excel(df, due_days, daily_rate, working_days, ob_age):
     # Clean Amount column
     df_filtered["Amount"] = clean_currency_column(df_filtered["Amount"])
 
-    # Clean Age column
-    df_filtered["Age"] = clean_age_column(df_filtered["Age"])
-
-    # For Customer Opening Balance rows, set Age to specified value
-    df_filtered.loc[df_filtered["Type"] == "Customer Opening Balance", "Age"] = ob_age
-
-    # Filter only rows where Age is greater than Due days threshold
-    df_filtered = df_filtered[df_filtered["Age"] > due_days].copy()
-
     # Sort by Customer Name alphabetically
-    df_filtered = df_filtered.sort_values("Customer Name").reset_index(drop=True)
-
-    # Add Due days column
-    df_filtered["Due days"] = due_days
-
-    # Calculate days overdue
-    days_overdue = df_filtered["Age"] - due_days
-
-    # Calculate interest working days: min(days_overdue, working_days)
-    # This caps the working days at 31 (or whatever working_days is set to)
-    df_filtered["interst working"] = days_overdue.clip(upper=working_days)
-
-    # Calculate Previous interest: cumulative days before current working period
-    # Formula: Previous interst = days_overdue - interst working
-    df_filtered["Previous interst"] = days_overdue - df_filtered["interst working"]
-
-    # Add per day interest rate column
-    df_filtered["per day interst%"] = daily_rate
+    df_filtered = df_filtered.sort_values(
+        "Customer Name", kind="stable", ignore_index=True
+    )
 
-    # Calculate working interest percentage based on actual working days
-    # Formula: working interst in % = interst working * per day interst%
-    df_filtered["working interst in %"] = df_filtered["interst working"] * daily_rate
+    # Calculate interest columns on the raw numpy arrays in one pass, on
+    # float64 Ages so subtracting due days cannot overflow a downcast dtype
+    interest_working, previous_interest, working_pct, interest_amount = (
+        compute_interest(
+            df_filtered["Age"].to_numpy(dtype="float64"),
+            df_filtered["Balance Due"].to_numpy(),
+            due_days,
+            daily_rate,
+            working_days,
+        )
+    )
 
-    # Calculate interest amount based on balance due
-    # Formula: interest amount = Balance Due * (working interst in % / 100)
-    df_filtered["interest amount"] = df_filtered["Balance Due"] * (
-        df_filtered["working interst in %"] / 100
+    df_filtered = df_filtered.assign(
+        **{
+            "interst working": pd.to_numeric(interest_working, downcast="integer"),
+            "Previous interst": pd.to_numeric(previous_interest, downcast="integer"),
+            "working interst in %": working_pct,
+            "interest amount": interest_amount,
+        }
     )
 
-    # Round interest amount to 4 decimal places
-    df_filtered["interest amount"] = df_filtered["interest amount"].round(4)
+    # Broadcast the constant Due days and per day interest rate columns
+    # only once the calculations are done, which only need the scalars
+    df_filtered["Due days"] = np.int32(due_days)
+    df_filtered["per day interst%"] = daily_rate
 
     # Return dataframe with reordered columns
     return df_filtered[FINAL_COLUMNS]
@@ -1,6 +1,119 @@
 # data_verifier.py - Data verification and comparison functions
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from config import MIN_POLARS_VERSION
+
+# polars is optional: without it rows are matched with a pandas merge
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+# Older polars releases lack the join options match_rows uses (nulls_equal),
+# so they fall back to the pandas merge too
+if (
+    pl is not None
+    and tuple(int(part) for part in pl.__version__.split(".")[:2]) < MIN_POLARS_VERSION
+):
+    pl = None
+
+# Low-cardinality text columns compared as categoricals
+CATEGORY_COLUMNS = ["Customer Name", "Type"]
+
+# Columns identifying the same row in both DataFrames
+KEY_COLUMNS = ["Customer Name", "Transaction#"]
+
+# Text dtype for the key columns rows are matched on
+KEY_DTYPE = pd.StringDtype("pyarrow")
+
+
+def as_categories(df, columns=CATEGORY_COLUMNS):
+    """
+    Cast text columns to categoricals so hashing works on integer codes
+    Returns a new DataFrame; the input is not modified
+    """
+    casts = [
+        col
+        for col in columns
+        if col in df.columns and pd.api.types.is_string_dtype(df[col].dtype)
+    ]
+    if not casts:
+        return df
+
+    # A shallow copy shares the other columns' data; assign() would copy
+    # the whole frame on pandas without Copy-on-Write
+    df = df.copy(deep=False)
+    for col in casts:
+        df[col] = df[col].astype("category")
+    return df
+
+
+def match_rows(processed_df, expected_df, key_columns):
+    """
+    Full outer join of two DataFrames on their key columns, compared as
+    text (so 123 and "123" agree)
+
+    Runs as a Polars lazy query when polars is installed, else a pandas merge
+    on factorized key codes
+
+    Returns:
+    - DataFrame with the key columns plus _proc_row and _exp_row row
+      positions (-1 where the key is missing on that side), sorted by position
+    """
+    # Arrow-backed text keys hash and convert to Polars without going through
+    # Python string objects (pandas 3 already stores str this way)
+    proc_keys = processed_df[key_columns].astype(str).astype(KEY_DTYPE)
+    exp_keys = expected_df[key_columns].astype(str).astype(KEY_DTYPE)
+
+    if pl is not None:
+        matches = (
+            pl.from_pandas(proc_keys)
+            .lazy()
+            .with_row_index("_proc_row")
+            .join(
+                pl.from_pandas(exp_keys).lazy().with_row_index("_exp_row"),
+                on=key_columns,
+                how="full",
+                coalesce=True,
+                nulls_equal=True,
+            )
+            .select(
+                *key_columns,
+                pl.col("_proc_row").cast(pl.Int64).fill_null(-1),
+                pl.col("_exp_row").cast(pl.Int64).fill_null(-1),
+            )
+            .collect()
+            .to_pandas()
+        )
+    else:
+        # Factorize the composite key once so the merge joins integer codes
+        # instead of several string columns
+        codes, uniques = pd.MultiIndex.from_frame(
+            pd.concat([proc_keys, exp_keys], ignore_index=True)
+        ).factorize()
+        proc_codes = pd.DataFrame(
+            {"_key": codes[: len(proc_keys)], "_proc_row": np.arange(len(proc_keys))}
+        )
+        exp_codes = pd.DataFrame(
+            {"_key": codes[len(proc_keys) :], "_exp_row": np.arange(len(exp_keys))}
+        )
+        merged = (
+            proc_codes.merge(exp_codes, on="_key", how="outer")
+            .fillna({"_proc_row": -1, "_exp_row": -1})
+            .astype({"_proc_row": np.int64, "_exp_row": np.int64})
+        )
+
+        # Map the codes back to their key values
+        matches = uniques[merged["_key"].to_numpy()].to_frame(
+            index=False, name=key_columns
+        )
+        matches["_proc_row"] = merged["_proc_row"].to_numpy()
+        matches["_exp_row"] = merged["_exp_row"].to_numpy()
+
+    return matches.sort_values(["_proc_row", "_exp_row"], ignore_index=True)
 
 
 def compare_dataframes(processed_df, expected_df):
@@ -10,6 +123,9 @@ def compare_dataframes(processed_df, expected_df):
     Returns:
     - Dictionary with comparison results
     """
+    processed_df = as_categories(processed_df)
+    expected_df = as_categories(expected_df)
+
     results = {
         "row_comparison": {},
         "column_comparison": {},
@@ -43,11 +159,16 @@ def compare_dataframes(processed_df, expected_df):
         "Customer Name" in processed_df.columns
         and "Customer Name" in expected_df.columns
     ):
-        processed_customers = set(processed_df["Customer Name"].unique())
-        expected_customers = set(expected_df["Customer Name"].unique())
+        # Set differences of the unique names, returned in sorted order
+        processed_customers = pd.Index(processed_df["Customer Name"].unique())
+        expected_customers = pd.Index(expected_df["Customer Name"].unique())
 
-        results["extra_in_processed"] = list(processed_customers - expected_customers)
-        results["missing_in_processed"] = list(expected_customers - processed_customers)
+        results["extra_in_processed"] = processed_customers.difference(
+            expected_customers
+        ).tolist()
+        results["missing_in_processed"] = expected_customers.difference(
+            processed_customers
+        ).tolist()
 
     # Summary
     results["summary"] = {
@@ -64,7 +185,7 @@ def compare_dataframes(processed_df, expected_df):
     return results
 
 
-def get_detailed_mismatches(processed_df, expected_df, key_columns=None):
+def get_detailed_mismatches(processed_df, expected_df, key_columns=None, matches=None):
     """
     Get detailed row-by-row mismatches between two DataFrames
 
@@ -72,12 +193,17 @@ def get_detailed_mismatches(processed_df, expected_df, key_columns=None):
     - processed_df: Processed DataFrame
     - expected_df: Expected DataFrame
     - key_columns: List of columns to use as keys for matching (default: Customer Name, Transaction#)
+    - matches: Result of match_rows for the same frames and key columns, if
+      the caller already has it (default: computed here)
 
     Returns:
     - DataFrame with mismatches
     """
     if key_columns is None:
-        key_columns = ["Customer Name", "Transaction#"]
+        key_columns = KEY_COLUMNS
+
+    processed_df = as_categories(processed_df)
+    expected_df = as_categories(expected_df)
 
     # Ensure key columns exist in both DataFrames
     for col in key_columns:
@@ -86,60 +212,73 @@ def get_detailed_mismatches(processed_df, expected_df, key_columns=None):
                 {"Error": [f"Key column '{col}' not found in one or both DataFrames"]}
             )
 
-    # Create copies to avoid modifying original DataFrames
-    proc_df = processed_df.copy()
-    exp_df = expected_df.copy()
-
-    # Create composite key
-    proc_df["_composite_key"] = proc_df[key_columns].astype(str).agg("||".join, axis=1)
-    exp_df["_composite_key"] = exp_df[key_columns].astype(str).agg("||".join, axis=1)
+    # Match rows on their key columns with a single outer join
+    if matches is None:
+        matches = match_rows(processed_df, expected_df, key_columns)
 
     # Find rows only in processed
-    only_in_processed_mask = ~proc_df["_composite_key"].isin(exp_df["_composite_key"])
-    only_in_processed = proc_df[only_in_processed_mask].copy()
+    proc_rows = matches.loc[matches["_exp_row"] < 0, "_proc_row"]
+    only_in_processed = processed_df.iloc[proc_rows.to_numpy()]
 
     # Find rows only in expected
-    only_in_expected_mask = ~exp_df["_composite_key"].isin(proc_df["_composite_key"])
-    only_in_expected = exp_df[only_in_expected_mask].copy()
-
-    # Build results list
-    mismatch_records = []
-
-    # Add extra rows from processed
-    for idx, row in only_in_processed.iterrows():
-        mismatch_records.append(
-            {
-                "Mismatch Type": "Extra in Processed",
-                "Customer Name": row.get("Customer Name", "N/A"),
-                "Transaction#": row.get("Transaction#", "N/A"),
-                "Type": row.get("Type", "N/A"),
-                "Age": row.get("Age", "N/A"),
-                "Balance Due": row.get("Balance Due", "N/A"),
-                "Interest Amount": row.get("interest amount", "N/A"),
-            }
-        )
+    exp_rows = matches.loc[matches["_proc_row"] < 0, "_exp_row"]
+    only_in_expected = expected_df.iloc[np.sort(exp_rows.to_numpy())]
+
+    # Report columns, with "N/A" for any missing from the source frame
+    report_columns = [
+        "Customer Name",
+        "Transaction#",
+        "Type",
+        "Age",
+        "Balance Due",
+        "interest amount",
+    ]
+
+    # Only sides with mismatches are labelled and concatenated
+    mismatch_frames = []
+    for mismatch_type, rows in (
+        ("Extra in Processed", only_in_processed),
+        ("Missing in Processed", only_in_expected),
+    ):
+        if len(rows) == 0:
+            continue
 
-    # Add missing rows from expected
-    for idx, row in only_in_expected.iterrows():
-        mismatch_records.append(
-            {
-                "Mismatch Type": "Missing in Processed",
-                "Customer Name": row.get("Customer Name", "N/A"),
-                "Transaction#": row.get("Transaction#", "N/A"),
-                "Type": row.get("Type", "N/A"),
-                "Age": row.get("Age", "N/A"),
-                "Balance Due": row.get("Balance Due", "N/A"),
-                "Interest Amount": row.get("interest amount", "N/A"),
-            }
+        frame = rows.reindex(columns=report_columns, fill_value="N/A").rename(
+            columns={"interest amount": "Interest Amount"}
         )
+        frame.insert(0, "Mismatch Type", mismatch_type)
+        mismatch_frames.append(frame)
 
-    if mismatch_records:
-        return pd.DataFrame(mismatch_records)
+    if mismatch_frames:
+        return pd.concat(mismatch_frames, ignore_index=True)
 
     return pd.DataFrame({"Message": ["No mismatches found! Data matches perfectly."]})
 
 
-def get_value_comparison(processed_df, expected_df, compare_columns=None):
+def numeric_differences(proc_values, exp_values, tolerance=0.01):
+    """
+    Flag aligned numeric values that differ by more than the tolerance
+    Missing values on either side never count as a difference
+
+    Returns:
+    - Boolean numpy array
+    """
+    proc_arr = pa.array(
+        proc_values.to_numpy(dtype="float64", na_value=np.nan), from_pandas=True
+    )
+    exp_arr = pa.array(
+        exp_values.to_numpy(dtype="float64", na_value=np.nan), from_pandas=True
+    )
+    differs = pc.greater(pc.abs(pc.subtract(proc_arr, exp_arr)), tolerance)
+
+    # Skip building the mask when nothing in the column differs
+    if not pc.any(differs).as_py():
+        return np.zeros(len(proc_arr), dtype=bool)
+
+    return pc.fill_null(differs, False).to_numpy(zero_copy_only=False)
+
+
+def get_value_comparison(processed_df, expected_df, compare_columns=None, matches=None):
     """
     Compare values for matching rows
 
@@ -147,6 +286,8 @@ def get_value_comparison(processed_df, expected_df, compare_columns=None):
     - processed_df: Processed DataFrame
     - expected_df: Expected DataFrame
     - compare_columns: Columns to compare (default: interest amount)
+    - matches: Result of match_rows for the same frames on KEY_COLUMNS, if
+      the caller already has it (default: computed here)
 
     Returns:
     - DataFrame with value comparisons
@@ -154,88 +295,130 @@ def get_value_comparison(processed_df, expected_df, compare_columns=None):
     if compare_columns is None:
         compare_columns = ["interest amount", "Balance Due", "Age"]
 
-    key_columns = ["Customer Name", "Transaction#"]
-
-    # Create copies to avoid modifying original DataFrames
-    proc_df = processed_df.copy()
-    exp_df = expected_df.copy()
+    key_columns = KEY_COLUMNS
 
-    # Create composite key
-    proc_df["_composite_key"] = proc_df[key_columns].astype(str).agg("||".join, axis=1)
-    exp_df["_composite_key"] = exp_df[key_columns].astype(str).agg("||".join, axis=1)
+    processed_df = as_categories(processed_df)
+    expected_df = as_categories(expected_df)
 
-    # Find matching rows
-    common_keys = set(proc_df["_composite_key"]) & set(exp_df["_composite_key"])
+    # Match rows on their key columns, using the first row for each key on
+    # either side (matches are ordered by processed then expected position)
+    if matches is None:
+        matches = match_rows(processed_df, expected_df, key_columns)
+    matched = matches[
+        (matches["_proc_row"] >= 0) & (matches["_exp_row"] >= 0)
+    ].drop_duplicates(key_columns)
 
-    if len(common_keys) == 0:
+    if len(matched) == 0:
         return pd.DataFrame({"Message": ["No matching rows found for comparison"]})
 
+    # Aligned rows from each side, one per matched key
+    proc_rows = processed_df.iloc[matched["_proc_row"].to_numpy()]
+    exp_rows = expected_df.iloc[matched["_exp_row"].to_numpy()]
+    customer_names = proc_rows["Customer Name"].to_numpy()
+    transactions = proc_rows["Transaction#"].to_numpy()
+
     comparisons = []
-    for key in list(common_keys)[:100]:  # Limit to first 100 for performance
-        proc_row = proc_df[proc_df["_composite_key"] == key].iloc[0]
-        exp_row = exp_df[exp_df["_composite_key"] == key].iloc[0]
-
-        for col in compare_columns:
-            if col in proc_df.columns and col in exp_df.columns:
-                proc_val = proc_row[col]
-                exp_val = exp_row[col]
-
-                # Check if values are different (with tolerance for floats)
-                if pd.notna(proc_val) and pd.notna(exp_val):
-                    try:
-                        proc_float = float(proc_val)
-                        exp_float = float(exp_val)
-                        if abs(proc_float - exp_float) > 0.01:  # Tolerance of 0.01
-                            comparisons.append(
-                                {
-                                    "Customer Name": proc_row["Customer Name"],
-                                    "Transaction#": proc_row["Transaction#"],
-                                    "Column": col,
-                                    "Processed Value": proc_val,
-                                    "Expected Value": exp_val,
-                                    "Difference": round(proc_float - exp_float, 4),
-                                }
-                            )
-                    except (ValueError, TypeError):
-                        # Non-numeric comparison
-                        if str(proc_val) != str(exp_val):
-                            comparisons.append(
-                                {
-                                    "Customer Name": proc_row["Customer Name"],
-                                    "Transaction#": proc_row["Transaction#"],
-                                    "Column": col,
-                                    "Processed Value": proc_val,
-                                    "Expected Value": exp_val,
-                                    "Difference": "N/A",
-                                }
-                            )
+    for col in compare_columns:
+        if col not in processed_df.columns or col not in expected_df.columns:
+            continue
+
+        proc_values = proc_rows[col]
+        exp_values = exp_rows[col]
+
+        if pd.api.types.is_numeric_dtype(proc_values) and pd.api.types.is_numeric_dtype(
+            exp_values
+        ):
+            # Numeric columns are compared whole with pyarrow compute
+            differs = numeric_differences(proc_values, exp_values)
+            if not differs.any():
+                continue
+
+            proc_diff = proc_values.to_numpy()[differs]
+            exp_diff = exp_values.to_numpy()[differs]
+            comparisons.append(
+                pd.DataFrame(
+                    {
+                        "Customer Name": customer_names[differs],
+                        "Transaction#": transactions[differs],
+                        "Column": col,
+                        "Processed Value": proc_diff,
+                        "Expected Value": exp_diff,
+                        "Difference": np.round(
+                            proc_diff.astype("float64") - exp_diff.astype("float64"),
+                            4,
+                        ),
+                    }
+                )
+            )
+            continue
+
+        # Mixed columns: values that parse as numbers on both sides are
+        # compared with the tolerance, anything else is compared as text
+        proc_objects = proc_values.astype(object)
+        exp_objects = exp_values.astype(object)
+        proc_numbers = pd.to_numeric(proc_objects, errors="coerce")
+        exp_numbers = pd.to_numeric(exp_objects, errors="coerce")
+        proc_numbers = proc_numbers.to_numpy(dtype="float64", na_value=np.nan)
+        exp_numbers = exp_numbers.to_numpy(dtype="float64", na_value=np.nan)
+
+        present = proc_values.notna().to_numpy() & exp_values.notna().to_numpy()
+        numeric = ~np.isnan(proc_numbers) & ~np.isnan(exp_numbers)
+        difference = proc_numbers - exp_numbers
+
+        numeric_differs = present & numeric & (np.abs(difference) > 0.01)
+        text_differs = (
+            present
+            & ~numeric
+            & (proc_values.astype(str).to_numpy() != exp_values.astype(str).to_numpy())
+        )
+        differs = numeric_differs | text_differs
+        if not differs.any():
+            continue
+
+        differences = np.full(len(differs), "N/A", dtype=object)
+        differences[numeric_differs] = np.round(difference[numeric_differs], 4)
+        comparisons.append(
+            pd.DataFrame(
+                {
+                    "Customer Name": customer_names[differs],
+                    "Transaction#": transactions[differs],
+                    "Column": col,
+                    "Processed Value": proc_objects.to_numpy()[differs],
+                    "Expected Value": exp_objects.to_numpy()[differs],
+                    "Difference": differences[differs],
+                }
+            )
+        )
 
     if comparisons:
-        return pd.DataFrame(comparisons)
+        return pd.concat(comparisons, ignore_index=True)
 
     return pd.DataFrame({"Message": ["All compared values match!"]})
 
 
-def get_summary_report(processed_df, expected_df):
+def get_summary_report(processed_df, expected_df, comparison=None):
     """
     Generate a comprehensive summary report
 
+    Parameters:
+    - processed_df: Processed DataFrame
+    - expected_df: Expected DataFrame
+    - comparison: Result of compare_dataframes for the same frames, if the
+      caller already has it (default: computed here)
+
     Returns:
     - Dictionary with summary information
     """
-    comparison = compare_dataframes(processed_df, expected_df)
+    if comparison is None:
+        comparison = compare_dataframes(processed_df, expected_df)
 
     report = {
         "Total Processed Rows": len(processed_df),
         "Total Expected Rows": len(expected_df),
         "Row Difference": comparison["row_comparison"]["difference"],
         "Columns Match": comparison["column_comparison"]["columns_match"],
-        "Extra Customers Count": len(comparison["extra_in_processed"])
-        if comparison["extra_in_processed"]
-        else 0,
-        "Missing Customers Count": len(comparison["missing_in_processed"])
-        if comparison["missing_in_processed"]
-        else 0,
+        "Extra Customers Count": comparison["summary"]["extra_customers"],
+        "Missing Customers Count": comparison["summary"]["missing_customers"],
     }
 
     # Calculate totals
@@ -0,0 +1,104 @@
+# kernels.py - Numeric kernels for interest calculation
+
+import numpy as np
+from config import NUMBA_MIN_ROWS
+
+# numba is optional: without it every sheet uses the numpy kernel
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+def _interest_numpy(age, balance_due, due_days, daily_rate, working_days):
+    """
+    Calculate interest columns with numpy array expressions
+    Returns tuple of (interst working, Previous interst, working interst in %,
+    interest amount) arrays
+    """
+    # Calculate days overdue
+    days_overdue = age - due_days
+
+    # Calculate interest working days: min(days_overdue, working_days)
+    # This caps the working days at 31 (or whatever working_days is set to)
+    interest_working = np.minimum(days_overdue, working_days)
+
+    # Formula: working interst in % = interst working * per day interst%
+    working_pct = interest_working * daily_rate
+
+    return (
+        interest_working,
+        # Formula: Previous interst = days_overdue - interst working
+        days_overdue - interest_working,
+        working_pct,
+        # Formula: interest amount = Balance Due * (working interst in % / 100)
+        # rounded to 4 decimal places
+        np.round(balance_due * (working_pct / 100), 4),
+    )
+
+
+if njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def _interest_loop(
+        age,
+        balance_due,
+        due_days,
+        daily_rate,
+        working_days,
+        out_working,
+        out_previous,
+        out_pct,
+        out_amount,
+    ):
+        """Fill all four interest columns in a single parallel pass"""
+        for i in prange(age.shape[0]):
+            days_overdue = age[i] - due_days
+            working = min(days_overdue, working_days)
+            out_working[i] = working
+            out_previous[i] = days_overdue - working
+            out_pct[i] = working * daily_rate
+            out_amount[i] = balance_due[i] * (out_pct[i] / 100)
+
+
+def compute_interest(age, balance_due, due_days, daily_rate, working_days):
+    """
+    Calculate interest columns for each row
+
+    Parameters:
+    - age: Numpy array of Age values
+    - balance_due: Numpy array of Balance Due values
+    - due_days: Due days threshold
+    - daily_rate: Per day interest rate percentage
+    - working_days: Maximum working days for interest calculation
+
+    Returns:
+    - Tuple of (interst working, Previous interst, working interst in %,
+      interest amount) arrays
+    """
+    if njit is None or len(age) < NUMBA_MIN_ROWS:
+        return _interest_numpy(age, balance_due, due_days, daily_rate, working_days)
+
+    # Day counts keep the dtype numpy would give (int for whole-day Ages)
+    day_dtype = np.result_type(age.dtype, np.min_scalar_type(due_days))
+    out_working = np.empty(len(age), dtype=day_dtype)
+    out_previous = np.empty(len(age), dtype=day_dtype)
+    out_pct = np.empty(len(age), dtype=np.float64)
+    out_amount = np.empty(len(age), dtype=np.float64)
+
+    _interest_loop(
+        np.ascontiguousarray(age),
+        np.ascontiguousarray(balance_due, dtype=np.float64),
+        due_days,
+        daily_rate,
+        working_days,
+        out_working,
+        out_previous,
+        out_pct,
+        out_amount,
+    )
+
+    # Rounded separately so results match the numpy kernel exactly
+    np.round(out_amount, 4, out=out_amount)
+
+    return out_working, out_previous, out_pct, out_amount
@@ -1,26 +1,160 @@
 # utils.py - Utility functions
 
 import pandas as pd
+import xlsxwriter
 from io import BytesIO
 
 
-def to_excel_bytes(df, sheet_name="Sheet1"):
+# Rows converted to Python values at a time when streaming to xlsxwriter
+EXCEL_WRITE_CHUNK_ROWS = 10_000
+
+
+def to_excel_bytes(df, sheet_name="Sheet1", engine="xlsxwriter"):
     """
     Convert DataFrame to Excel bytes for download
 
     Parameters:
     - df: DataFrame to convert
     - sheet_name: Name of the Excel sheet
+    - engine: Excel writer engine (xlsxwriter, or openpyxl for formatting-heavy sheets)
 
     Returns:
     - Bytes object containing Excel file
     """
     output = BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name=sheet_name)
+    write_excel(df, output, sheet_name, engine)
     return output.getvalue()
 
 
+def write_excel(df, sink, sheet_name="Sheet1", engine="xlsxwriter"):
+    """
+    Write DataFrame as an Excel file to a path or file-like sink
+
+    Use this instead of to_excel_bytes when the caller can pass an open
+    file or response stream; with xlsxwriter the rows are streamed to the
+    sink rather than buffering the finished workbook in memory
+
+    Parameters:
+    - df: DataFrame to write
+    - sink: File path or writable binary file-like object
+    - sheet_name: Name of the Excel sheet
+    - engine: Excel writer engine (xlsxwriter, or openpyxl for formatting-heavy sheets)
+    """
+    if engine == "xlsxwriter":
+        write_excel_rows(df, sink, sheet_name)
+    else:
+        with pd.ExcelWriter(sink, engine=engine) as writer:
+            df.to_excel(writer, index=False, sheet_name=sheet_name)
+
+
+def write_excel_rows(df, sink, sheet_name="Sheet1"):
+    """
+    Write DataFrame to an .xlsx sink row by row
+
+    Uses xlsxwriter's constant_memory mode, which keeps only the current
+    row in memory. pandas' to_excel cannot use it because it writes cells
+    column by column, and that mode drops cells written out of row order.
+
+    Parameters:
+    - df: DataFrame to write
+    - sink: File path or writable binary file-like object
+    - sheet_name: Name of the Excel sheet
+    """
+    workbook = xlsxwriter.Workbook(
+        sink,
+        {
+            "constant_memory": True,
+            "default_date_format": "yyyy-mm-dd hh:mm:ss",
+            "nan_inf_to_errors": True,
+        },
+    )
+    worksheet = workbook.add_worksheet(sheet_name)
+
+    # Header row styled like pandas' to_excel header
+    header_format = workbook.add_format(
+        {"bold": True, "border": 1, "align": "center", "valign": "top"}
+    )
+    worksheet.write_row(0, 0, [str(col) for col in df.columns], header_format)
+
+    row = 1
+    for start in range(0, len(df), EXCEL_WRITE_CHUNK_ROWS):
+        chunk = df.iloc[start : start + EXCEL_WRITE_CHUNK_ROWS]
+
+        # Python values per column, with missing values left as blank cells
+        columns = [
+            values.astype(object).where(values.notna(), None).tolist()
+            for _, values in chunk.items()
+        ]
+        for values in zip(*columns):
+            worksheet.write_row(row, 0, values)
+            row += 1
+
+    workbook.close()
+
+
+def read_excel_file(source, file_name="", columns=None):
+    """
+    Read an Excel file into a DataFrame
+
+    Parameters:
+    - source: File path or file-like object
+    - file_name: Original file name, used to pick the parser engine
+    - columns: Only read these columns, if present (default: all columns)
+
+    Returns:
+    - DataFrame with the first sheet's contents, backed by pyarrow dtypes
+    """
+    # calamine (Rust-backed) is much faster than openpyxl for .xlsx;
+    # legacy .xls files keep pandas' default engine
+    engine = None if str(file_name).lower().endswith(".xls") else "calamine"
+
+    # A callable skips unlisted columns without failing on missing ones,
+    # which validate_input_columns reports instead
+    usecols = None if columns is None else lambda col: col in columns
+    df = pd.read_excel(source, engine=engine, usecols=usecols)
+
+    # Converted after parsing: read_excel(dtype_backend="pyarrow") fails on
+    # columns mixing numbers and text (e.g. Transaction#), which stay object
+    return df.convert_dtypes(dtype_backend="pyarrow")
+
+
+def df_shrink(df, obj2cat=True, max_category_ratio=0.5):
+    """
+    Store DataFrame columns in the most compact dtypes that keep every value
+
+    Parameters:
+    - df: DataFrame to shrink
+    - obj2cat: Convert repetitive text columns to categoricals
+    - max_category_ratio: Largest distinct/total value ratio for a categorical
+
+    Returns:
+    - New DataFrame with compact dtypes (the input is not modified)
+    """
+    df = df.copy(deep=False)
+    for col, values in df.items():
+        if pd.api.types.is_bool_dtype(values):
+            continue
+
+        if pd.api.types.is_integer_dtype(values):
+            df[col] = pd.to_numeric(values, downcast="integer")
+        elif pd.api.types.is_float_dtype(values):
+            # float32 only when no value loses precision (e.g. rupee amounts)
+            shrunk = pd.to_numeric(values, downcast="float")
+            if shrunk.dtype != values.dtype and shrunk.astype(values.dtype).equals(
+                values
+            ):
+                df[col] = shrunk
+        elif (
+            obj2cat
+            and pd.api.types.is_string_dtype(values.dtype)
+            and len(values)
+            and values.nunique() / len(values) < max_category_ratio
+        ):
+            df[col] = values.astype("category")
+
+    return df
+
+
 def validate_input_columns(df, required_columns):
     """
     Validate that DataFrame has required columns
@@ -53,9 +187,5 @@ def get_summary_stats(df, column_name):
     if column_name not in df.columns:
         return None
 
-    return {
-        "sum": df[column_name].sum(),
-        "mean": df[column_name].mean(),
-        "max": df[column_name].max(),
-        "min": df[column_name].min(),
-    }
+    # One agg call computes all four reductions on the column
+    return df[column_name].agg(["sum", "mean", "max", "min"]).to_dict()